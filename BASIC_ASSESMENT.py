@@ -1,18 +1,31 @@
 import streamlit as st
+import plotly.express as px
+import plotly.graph_objects as go
 import pandas as pd
+import numpy as np
 from datetime import datetime, timedelta
 import os
 import dotenv
 from web3 import Web3
 import requests
-from dateutil import parser
 import json
-import pickle  # For saving/loading search history
-from supabase import create_client, Client
-from typing import List, Dict, Any
-import random
+import orjson
+from supabase import create_client, Client, ClientOptions
+from postgrest.exceptions import APIError
+import httpx
+from typing import List, Dict, Any, Tuple, Callable
+from collections import OrderedDict
+import heapq
+import itertools
+import threading
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
 from st_social_media_links import SocialMediaIcons
 
+# Diagnostics go through logging; debug output is skipped unless the level is enabled
+logger = logging.getLogger(__name__)
+
 # Cookie management functions
 def get_cookie(name: str, default: Any = None) -> Any:
     """Get a cookie value by name."""
@@ -35,14 +48,99 @@ st.set_page_config(
     page_icon="🔍",
     layout="wide"
 )
-# Custom CSS for page title color
-st.markdown("""
-    <style>
+# Custom CSS, the single stylesheet for every class used in the app (page title color included)
+# Injected on every rerun: Streamlit drops any element a rerun does not emit again
+APP_CSS = """
     .st-emotion-cache-10trbll {
         color: #102E50 !important;
     }
-    </style>
-""", unsafe_allow_html=True)
+    .main-header {
+        font-size: 2.5rem;
+        color: #102E50 !important;
+        text-align: center;
+        margin-bottom: 1rem;
+        font-weight: bold;
+    }
+    .sub-header {
+        font-size: 2.0rem;
+        color: #424242;
+        margin-bottom: 1rem;
+    }
+    .block-container {
+        padding: 2rem 1rem;
+    }
+    .info-box {
+        background-color: #f0f2f6;
+        border-radius: 10px;
+        padding: 1rem;
+        margin-bottom: 1rem;
+    }
+    .metric-card {
+        background-color: #ffffff;
+        border-radius: 10px;
+        box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
+        padding: 1.5rem;
+        margin-bottom: 1rem;
+    }
+    .warning-tag {
+        background-color: #ffcdd2;
+        color: #b71c1c;
+        padding: 2px 6px;
+        border-radius: 4px;
+        font-size: 0.8rem;
+        font-weight: bold;
+    }
+    .history-item {
+        padding: 8px;
+        margin: 4px 0;
+        border-radius: 4px;
+        background-color: #f5f5f5;
+        cursor: pointer;
+    }
+    .history-item:hover {
+        background-color: #e0e0e0;
+    }
+    .history-timestamp {
+        color: #757575;
+        font-size: 0.8rem;
+    }
+    .history-address {
+        font-weight: bold;
+    }
+    .history-blockchain {
+        color: #1E88E5;
+        font-size: 0.9rem;
+    }
+    .search-container {
+        background-color: #ffffff;
+        padding: 2rem;
+        border-radius: 10px;
+        box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+        margin-bottom: 2rem;
+    }
+    .search-title {
+        color: #1E3A8A;
+        font-size: 1.2rem;
+        margin-bottom: 1rem;
+    }
+    .dataframe-container {
+        background-color: white;
+        padding: 1rem;
+        border-radius: 8px;
+        box-shadow: 0 2px 4px rgba(0,0,0,0.05);
+    }
+    .header-container {
+        display: flex;
+        justify-content: space-between;
+        align-items: center;
+        margin-bottom: 1rem;
+    }
+    .page-selector {
+        width: 100px;
+        float: right;
+    }
+"""
+st.markdown(f"<style>{APP_CSS}</style>", unsafe_allow_html=True)
 
 # Social Media (main page only)
 social_media_links = [
@@ -57,138 +155,305 @@ def init_connection():
     try:
         url = st.secrets["SUPABASE_URL"]
         key = st.secrets["SUPABASE_KEY"]
-        client = create_client(url, key)
-        print("Supabase client created successfully")
+        # One pooled keep-alive HTTP client shared by every directory page request
+        http_client = httpx.Client(
+            limits=httpx.Limits(max_keepalive_connections=10, max_connections=20),
+            timeout=120
+        )
+        # httpx_client needs supabase >= 2.16 (pinned in requirements.txt)
+        client = create_client(url, key, options=ClientOptions(httpx_client=http_client))
+        logger.info("Supabase client created successfully")
         return client
     except Exception as e:
         st.error(f"Failed to create Supabase client: {str(e)}")
-        print(f"Failed to create Supabase client: {str(e)}")
+        logger.error("Failed to create Supabase client: %s", e)
         return None
 
 supabase = init_connection()
 
-# Set up file paths
-try:    
-    # File path configuration
-    file_path = "C:\\Users\\Oscar\\CascadeProjects\\assesments"
-    os.chdir(file_path)
+# Schema of the directory tables: the columns pulled, and the default used when one is missing
+# Only contract_address is guaranteed; older tables may lack the others (see fetch_directory_rows)
+# blockchain is only filtered on, never selected: every cached frame holds a single chain
+SUSPICIOUS_TOKEN_SCHEMA = {
+    'contract_address': '',
+    'tag': 'Unknown',
+    'tag_1': 'Unknown',
+    'created_block_timestamp': '',
+    'name': ''
+}
+SAFE_TOKEN_SCHEMA = {
+    'contract_address': '',
+    'tag': 'Unknown',
+    'tag_1': 'No Detail'
+}
+
+def apply_token_schema(df: pd.DataFrame, schema: Dict[str, str]) -> pd.DataFrame:
+    """Add any missing schema column with its default and keep exactly the schema's columns."""
+    missing = {column: default for column, default in schema.items() if column not in df.columns}
+    if missing:
+        logger.warning("Columns %s not found in tokens data, using defaults", list(missing))
+    return df.assign(**missing)[list(schema)]
+
+# PostgREST error code for a selected column that does not exist
+UNDEFINED_COLUMN_CODE = "42703"
+
+def fetch_directory_rows(fetch_rows: Callable[[str], List[Dict[str, Any]]], schema: Dict[str, str]) -> List[Dict[str, Any]]:
+    """Fetch only the schema's columns, or every column when the table lacks some of them."""
+    try:
+        return fetch_rows(",".join(schema))
+    except APIError as e:
+        # An explicit select fails outright on a missing column, so retry with * and
+        # let apply_token_schema fill in the defaults for whatever is absent
+        if e.code != UNDEFINED_COLUMN_CODE:
+            raise
+        logger.warning("Directory table is missing schema columns (%s), selecting all columns", e.message)
+        return fetch_rows("*")
+
+# Fetch all rows of a directory table for one blockchain
+def fetch_blockchain_rows(table: str, blockchain: str, columns: str = "*", page_size: int = 1000) -> List[Dict[str, Any]]:
+    """Page through the table with a contract_address cursor, so every page is an index range scan."""
+    rows = []
+    last_seen = None
+    while True:
+        # Rows without an address can't be keyed or paged past (NULLs sort last), so skip them server-side
+        query = supabase.table(table) \
+            .select(columns) \
+            .eq("blockchain", blockchain.lower()) \
+            .not_.is_("contract_address", "null")
+        if last_seen is not None:
+            query = query.gt("contract_address", last_seen)
+        response = query.order("contract_address").limit(page_size).execute()
+        page = response.data if hasattr(response, "data") and response.data else []
+        rows.extend(page)
+        # A short page is the last one
+        if len(page) < page_size:
+            return rows
+        cursor = page[-1].get("contract_address")
+        # Never re-request a page: a cursor that is missing or doesn't advance would loop forever
+        if cursor is None or (last_seen is not None and cursor <= last_seen):
+            raise RuntimeError(f"Paging {table} for {blockchain} stalled at contract_address {cursor!r}")
+        last_seen = cursor
+
+# Fetch only the directory rows for the given contract addresses
+def fetch_rows_by_addresses(table: str, blockchain: str, addresses, columns: str = "*", batch_size: int = 100) -> List[Dict[str, Any]]:
+    """Query the directory with contract_address IN (...) batches instead of pulling the whole chain."""
+    # The table may hold either casing, so ask for both the lowercase and checksummed forms
+    candidates = set()
+    for address in addresses:
+        candidates.add(address)
+        try:
+            candidates.add(Web3.to_checksum_address(address))
+        except ValueError:
+            pass
+    candidates = sorted(candidates)
+
+    rows = []
+    for start in range(0, len(candidates), batch_size):
+        response = supabase.table(table) \
+            .select(columns) \
+            .eq("blockchain", blockchain.lower()) \
+            .in_("contract_address", candidates[start:start + batch_size]) \
+            .execute()
+        if hasattr(response, "data") and response.data:
+            rows.extend(response.data)
+    return rows
+
+# On-disk copies of the directory tables, served until they are older than the TTL
+DIRECTORY_CACHE_DIR = "cache"
+DIRECTORY_CACHE_TTL = 3600  # seconds
+DIRECTORY_WARM_RETRY = 300  # seconds between background builds after a failed one
+
+def refresh_disk_cache(path: str, fetch: Callable[[], pd.DataFrame]) -> pd.DataFrame:
+    """Run fetch() and atomically replace the parquet copy at path with its result."""
+    # fetch() raises on failure, so an empty result is a real empty directory and is written
+    # too: the file's presence is what marks the chain as warm for identify_*_transfers
+    df = fetch()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    df.to_parquet(tmp_path, compression='zstd', index=False)
+    os.replace(tmp_path, path)
+    return df
+
+def directory_cache_path(cache_name: str) -> str:
+    return os.path.join(DIRECTORY_CACHE_DIR, f"{cache_name}.parquet")
+
+# Cache names with a background build in flight, and when each one's last build failed
+_warming_caches = set()
+_warming_failures: Dict[str, float] = {}
+_warming_lock = threading.Lock()
+
+def warm_disk_cache(cache_name: str, fetch: Callable[[], pd.DataFrame]) -> None:
+    """Build the parquet copy of fetch() in a background thread, once per cache name."""
+    with _warming_lock:
+        if cache_name in _warming_caches:
+            return
+        # Don't start a full pull on every search while the directory keeps failing
+        if time.time() - _warming_failures.get(cache_name, 0) < DIRECTORY_WARM_RETRY:
+            return
+        _warming_caches.add(cache_name)
+
+    def build():
+        try:
+            refresh_disk_cache(directory_cache_path(cache_name), fetch)
+            with _warming_lock:
+                _warming_failures.pop(cache_name, None)
+        except Exception as e:
+            logger.error("Error warming cached %s: %s", cache_name, e)
+            with _warming_lock:
+                _warming_failures[cache_name] = time.time()
+        finally:
+            with _warming_lock:
+                _warming_caches.discard(cache_name)
+
+    threading.Thread(target=build, daemon=True).start()
+
+def load_with_disk_cache(cache_name: str, fetch: Callable[[], pd.DataFrame]) -> pd.DataFrame:
+    """Serve the parquet copy of fetch() immediately, refreshing it in the background once stale."""
+    path = directory_cache_path(cache_name)
+    if os.path.exists(path):
+        try:
+            if time.time() - os.path.getmtime(path) > DIRECTORY_CACHE_TTL:
+                # warm_disk_cache runs one refresh per cache name and backs off after failures;
+                # the file stays stale (and keeps asking) until a refresh actually replaces it
+                warm_disk_cache(cache_name, fetch)
+            return pd.read_parquet(path)
+        except Exception as e:
+            logger.error("Error reading cached %s: %s", cache_name, e)
+    return refresh_disk_cache(path, fetch)
 
-    # Search history file path
-    search_history_path = os.path.join(file_path, "search_history.pkl")
+# Load suspicious tokens by blockchain from the parquet copy
+# Not cached itself: its only callers are the per-chain token lookups, which are cached for an hour
+def load_suspicious_tokens_by_blockchain(blockchain):
+    return load_with_disk_cache(
+        f"suspicious_tokens_{blockchain.lower()}",
+        lambda: fetch_suspicious_tokens_by_blockchain(blockchain)
+    )
 
-except Exception as e:
-    print(f"Error setting up file paths: {str(e)}")
-    search_history_path = None
+def load_safe_tokens_by_blockchain(blockchain):
+    return load_with_disk_cache(
+        f"safe_tokens_{blockchain.lower()}",
+        lambda: fetch_safe_tokens_by_blockchain(blockchain)
+    )
 
-# Load suspicious tokens by blockchain
-def load_suspicious_tokens_by_blockchain(blockchain):
+def fetch_token_lookup_for_addresses(table: str, blockchain: str, addresses, schema: Dict[str, str], fields: List[str]) -> Dict[str, tuple]:
+    """Token lookup holding only the given addresses, queried straight from the directory table."""
+    if supabase is None:
+        # Without the directory every token would look clean, so fail the search instead
+        raise RuntimeError("Supabase client is not initialized. Check your credentials.")
+    rows = fetch_directory_rows(
+        lambda columns: fetch_rows_by_addresses(table, blockchain, addresses, columns), schema
+    )
+    if not rows:
+        return {}
+    df = apply_token_schema(pd.DataFrame(rows), schema)
+    df['contract_address'] = df['contract_address'].str.lower()
+    return build_token_lookup(df, fields)
+
+# Fetch suspicious tokens by blockchain from Supabase
+def fetch_suspicious_tokens_by_blockchain(blockchain):
     try:
         # First check if supabase client is available
         if supabase is None:
-            st.error("Supabase client is not initialized. Check your credentials.")
-            return pd.DataFrame()
-
-        all_data = []
-        page_size = 1000
-        current_page = 0
-        print(f"Loading suspicious tokens for blockchain: {blockchain}")  # Debug print
-        while True:
-            response = supabase.table("suspicious_tokens_directory") \
-                .select("*") \
-                .eq("blockchain", blockchain.lower()) \
-                .range(current_page * page_size, (current_page + 1) * page_size - 1) \
-                .execute()
-            if not hasattr(response, "data") or not response.data:
-                break
-            all_data.extend(response.data)
-            if len(response.data) < page_size:
-                break
-            current_page += 1
+            raise RuntimeError("Supabase client is not initialized. Check your credentials.")
+
+        logger.debug("Loading suspicious tokens for blockchain: %s", blockchain)
+        all_data = fetch_directory_rows(
+            lambda columns: fetch_blockchain_rows("suspicious_tokens_directory", blockchain, columns),
+            SUSPICIOUS_TOKEN_SCHEMA
+        )
         if all_data:
             df = pd.DataFrame(all_data)
-            print(f"Found {len(df)} suspicious tokens for {blockchain}")  # Debug print
-            print(f"Columns in suspicious tokens DataFrame: {df.columns.tolist()}")  # Debug print
-            # Check if tag_1 column exists
-            if 'tag_1' not in df.columns:
-                print("WARNING: 'tag_1' column not found in suspicious tokens data")
-                # Add a default tag_1 column if it doesn't exist
-                df['tag_1'] = 'Unknown'
-            # Check if tag column exists
-            if 'tag' not in df.columns:
-                print("WARNING: 'tag' column not found in suspicious tokens data")
-                # Add a default tag column if it doesn't exist
-                df['tag'] = 'Unknown'
-            # Check if created_block_timestamp column exists (correct name)
-            if 'created_block_timestamp' not in df.columns:
-                print("WARNING: 'created_block_timestamp' column not found in suspicious tokens data")
-                df['created_block_timestamp'] = ''
-            # For backwards compatibility, remove any old created_blocktime_stamp column
-            if 'created_blocktime_stamp' in df.columns:
-                df = df.drop(columns=['created_blocktime_stamp'])
-            # Check if name column exists
-            if 'name' not in df.columns:
-                print("WARNING: 'name' column not found in suspicious tokens data")
-                df['name'] = ''
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Found %d suspicious tokens for %s, columns: %s", len(df), blockchain, df.columns.tolist())
+            df = apply_token_schema(df, SUSPICIOUS_TOKEN_SCHEMA)
+            # Lowercase addresses once here so lookups never have to
+            df['contract_address'] = df['contract_address'].str.lower()
             # Remove duplicate tokens based on contract_address (keep first occurrence)
             df = df.drop_duplicates(subset=['contract_address'])
-            return df[['contract_address', 'blockchain', 'tag', 'tag_1', 'created_block_timestamp', 'name']]
-        print(f"No suspicious tokens found for {blockchain}")  # Debug print
-        return pd.DataFrame()
-    except Exception as e:
-        print(f"Error loading suspicious tokens: {str(e)}")
-        return pd.DataFrame()
-
-def load_safe_tokens_by_blockchain(blockchain):
+            # Tags are a handful of repeated labels, store them as categoricals
+            df[['tag', 'tag_1']] = df[['tag', 'tag_1']].astype('category')
+            return df
+        logger.debug("No suspicious tokens found for %s", blockchain)
+        return pd.DataFrame(columns=list(SUSPICIOUS_TOKEN_SCHEMA))
+    except Exception:
+        # Raise rather than return an empty frame, which would be cached as "no suspicious tokens"
+        logger.exception("Error loading suspicious tokens for %s", blockchain)
+        raise
+
+# Fetch safe tokens by blockchain from Supabase
+def fetch_safe_tokens_by_blockchain(blockchain):
     try:
         # First check if supabase client is available
         if supabase is None:
-            st.error("Supabase client is not initialized. Check your credentials.")
-            return pd.DataFrame()
+            raise RuntimeError("Supabase client is not initialized. Check your credentials.")
         
-        all_data = []
-        page_size = 1000
-        current_page = 0
-            
-        print(f"Loading safe tokens for blockchain: {blockchain}")  # Debug print
+        logger.debug("Loading safe tokens for blockchain: %s", blockchain)
             
-        while True:
-            response = supabase.table("safe_tokens") \
-                .select("*") \
-                .eq("blockchain", blockchain.lower()) \
-                .range(current_page * page_size, (current_page + 1) * page_size - 1) \
-                .execute()
-                
-            if not hasattr(response, "data") or not response.data:
-                break
-                
-            all_data.extend(response.data)
-                
-            if len(response.data) < page_size:
-                break
-            
-            current_page += 1
+        all_data = fetch_directory_rows(
+            lambda columns: fetch_blockchain_rows("safe_tokens", blockchain, columns),
+            SAFE_TOKEN_SCHEMA
+        )
             
         if all_data:
             df = pd.DataFrame(all_data)
-            print(f"Found {len(df)} safe tokens for {blockchain}")  # Debug print
-            print(f"Columns in safe tokens DataFrame: {df.columns.tolist()}")  # Debug print
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Found %d safe tokens for %s, columns: %s", len(df), blockchain, df.columns.tolist())
                 
-            # Check if tag_1 column exists
-            if 'tag_1' not in df.columns:
-                print("WARNING: 'tag_1' column not found in safe tokens data")
-                # Add a default tag_1 column if it doesn't exist
-                df['tag_1'] = 'No Detail'
-                
-            return df[['contract_address', 'blockchain', 'tag', 'tag_1']]
+            df = apply_token_schema(df, SAFE_TOKEN_SCHEMA)
+            # Lowercase addresses once here so lookups never have to
+            df['contract_address'] = df['contract_address'].str.lower()
+            # Tags are a handful of repeated labels, store them as categoricals
+            df[['tag', 'tag_1']] = df[['tag', 'tag_1']].astype('category')
+            return df
             
-        print(f"No safe tokens found for {blockchain}")  # Debug print
-        return pd.DataFrame()
+        logger.debug("No safe tokens found for %s", blockchain)
+        return pd.DataFrame(columns=list(SAFE_TOKEN_SCHEMA))
             
-    except Exception as e:
-        st.error(f"Error loading safe tokens for {blockchain}: {str(e)}")
-        import traceback
-        st.error(f"Detailed error: {traceback.format_exc()}")
+    except Exception:
+        # Raise rather than return an empty frame, which would be cached as "no safe tokens"
+        logger.exception("Error loading safe tokens for %s", blockchain)
+        raise
+
+# Directory fields attached to matching transfers
+SUSPICIOUS_TOKEN_FIELDS = ['tag', 'tag_1', 'created_block_timestamp', 'name']
+SAFE_TOKEN_FIELDS = ['tag', 'tag_1']
+
+def build_token_lookup(tokens_df: pd.DataFrame, fields: List[str]) -> Dict[str, tuple]:
+    """Build a {contract_address: (field, ...)} dict from a token directory."""
+    if tokens_df.empty:
+        return {}
+    addresses = tokens_df['contract_address']
+    # Keep the first occurrence of each address
+    first = ~addresses.duplicated()
+    return dict(zip(addresses[first], zip(*(tokens_df.loc[first, field] for field in fields))))
+
+@st.cache_resource(ttl=3600)
+def load_suspicious_token_lookup(blockchain: str) -> Dict[str, tuple]:
+    """Suspicious token lookup for a blockchain, shared read-only across sessions."""
+    return build_token_lookup(load_suspicious_tokens_by_blockchain(blockchain), SUSPICIOUS_TOKEN_FIELDS)
+
+@st.cache_resource(ttl=3600)
+def load_safe_token_lookup(blockchain: str) -> Dict[str, tuple]:
+    """Safe token lookup for a blockchain, shared read-only across sessions."""
+    return build_token_lookup(load_safe_tokens_by_blockchain(blockchain), SAFE_TOKEN_FIELDS)
+
+def tag_transfers(transfers_df: pd.DataFrame, token_lookup: Dict[str, tuple], fields: List[str]) -> pd.DataFrame:
+    """Return the transfers whose contract_address is in token_lookup, with the lookup fields attached."""
+    # One dict probe per transfer; isin() would hash every directory key on each call
+    matches = [token_lookup.get(address) for address in transfers_df['contract_address']]
+    mask = np.fromiter((match is not None for match in matches), dtype=bool, count=len(matches))
+    # Nothing in this search is in the directory, skip building and joining the details
+    if not mask.any():
         return pd.DataFrame()
+    tagged = transfers_df.loc[mask]
+    details = pd.DataFrame(
+        [match for match in matches if match is not None],
+        index=tagged.index,
+        columns=fields
+    )
+    # The tags are a handful of repeated labels, keep them categorical like the directory
+    details[['tag', 'tag_1']] = details[['tag', 'tag_1']].astype('category')
+    return tagged.join(details)
 
 # Modify the identify_suspicious_transfers function to use blockchain-specific data
 def identify_suspicious_transfers(transfers_df):
@@ -197,30 +462,32 @@ def identify_suspicious_transfers(transfers_df):
             # Get the blockchain from the transfers data
             blockchain = transfers_df['blockchain'].iloc[0]
                 
-            # Load suspicious tokens for this specific blockchain
-            suspicious_tokens = load_suspicious_tokens_by_blockchain(blockchain)
-                
-            if not suspicious_tokens.empty:
-                # Ensure lowercase contract addresses for consistent matching
-                transfers_df['contract_address'] = transfers_df['contract_address'].str.lower()
-                suspicious_tokens['contract_address'] = suspicious_tokens['contract_address'].str.lower()
-                
-                # Merge transfers with suspicious tokens directory
-                suspicious_transfers = pd.merge(
-                    transfers_df,
-                    suspicious_tokens,
-                    on=['contract_address'],
-                    how='inner'
+            cache_name = f"suspicious_tokens_{blockchain.lower()}"
+            if os.path.exists(directory_cache_path(cache_name)):
+                # Load suspicious token lookup for this specific blockchain
+                suspicious_lookup = load_suspicious_token_lookup(blockchain)
+            else:
+                # Cold start: build the full chain copy in the background and
+                # only ask the directory about the contracts in this search
+                warm_disk_cache(cache_name, lambda: fetch_suspicious_tokens_by_blockchain(blockchain))
+                suspicious_lookup = fetch_token_lookup_for_addresses(
+                    "suspicious_tokens_directory", blockchain, transfers_df['contract_address'].unique(),
+                    SUSPICIOUS_TOKEN_SCHEMA, SUSPICIOUS_TOKEN_FIELDS
                 )
                 
+            if suspicious_lookup:
+                # Map transfers onto the suspicious tokens directory
+                suspicious_transfers = tag_transfers(transfers_df, suspicious_lookup, SUSPICIOUS_TOKEN_FIELDS)
+                
                 return suspicious_transfers
             else:
-                print(f"No high risk tokens found for blockchain {blockchain}")
+                logger.debug("No high risk tokens found for blockchain %s", blockchain)
                 return pd.DataFrame()
                 
-        except Exception as e:
-            st.error(f"Error in identify_suspicious_transfers: {str(e)}")
-            return pd.DataFrame()
+        except Exception:
+            # Re-raise so a directory failure fails the analysis instead of reading as "no matches"
+            logger.exception("Error in identify_suspicious_transfers")
+            raise
         
     return pd.DataFrame()
 
@@ -230,47 +497,48 @@ def identify_safe_transfers(transfers_df):
             # Get the blockchain from the transfers data
             blockchain = transfers_df['blockchain'].iloc[0]
                 
-            # Load safe tokens for this specific blockchain
-            safe_tokens = load_safe_tokens_by_blockchain(blockchain)
-                
-            if not safe_tokens.empty:
-                # Ensure lowercase contract addresses for consistent matching
-                transfers_df['contract_address'] = transfers_df['contract_address'].str.lower()
-                safe_tokens['contract_address'] = safe_tokens['contract_address'].str.lower()
-                
-                # Merge transfers with safe tokens directory
-                safe_transfers = pd.merge(
-                    transfers_df,
-                    safe_tokens,
-                    on=['contract_address'],
-                    how='inner'
+            cache_name = f"safe_tokens_{blockchain.lower()}"
+            if os.path.exists(directory_cache_path(cache_name)):
+                # Load safe token lookup for this specific blockchain
+                safe_lookup = load_safe_token_lookup(blockchain)
+            else:
+                # Cold start: same targeted query as identify_suspicious_transfers
+                warm_disk_cache(cache_name, lambda: fetch_safe_tokens_by_blockchain(blockchain))
+                safe_lookup = fetch_token_lookup_for_addresses(
+                    "safe_tokens", blockchain, transfers_df['contract_address'].unique(),
+                    SAFE_TOKEN_SCHEMA, SAFE_TOKEN_FIELDS
                 )
                 
+            if safe_lookup:
+                # Map transfers onto the safe tokens directory
+                safe_transfers = tag_transfers(transfers_df, safe_lookup, SAFE_TOKEN_FIELDS)
+                
                 return safe_transfers
             else:
-                print(f"No safe tokens found for blockchain {blockchain}")
+                logger.debug("No safe tokens found for blockchain %s", blockchain)
                 return pd.DataFrame()
                 
-        except Exception as e:
-            st.error(f"Error in identify_safe_transfers: {str(e)}")
-            return pd.DataFrame()
+        except Exception:
+            # Re-raise so a directory failure fails the analysis instead of reading as "no matches"
+            logger.exception("Error in identify_safe_transfers")
+            raise
         
     return pd.DataFrame()
 
-try:
-    suspicious_tokens_loaded = True
-except Exception as e:
-    suspicious_tokens_loaded = False
-    search_history_path = None
+# Maximum number of searches kept in history
+SEARCH_HISTORY_LIMIT = 100
 
 # Load search history or create a new one
-def load_search_history() -> List[Dict[str, Any]]:
+# Keyed by (lowercased address, blockchain), newest search first
+def load_search_history() -> "OrderedDict[Tuple[str, str], Dict[str, Any]]":
     """Load search history from cookies."""
-    history = get_cookie('search_history', [])
+    history = get_cookie('search_history')
+    if history is None:
+        history = OrderedDict()
     return history
 
 # Save search history
-def save_search_history(history: List[Dict[str, Any]]) -> bool:
+def save_search_history(history: "OrderedDict[Tuple[str, str], Dict[str, Any]]") -> bool:
     """Save search history to cookies."""
     try:
         set_cookie('search_history', history)
@@ -288,123 +556,143 @@ def add_to_search_history(address: str, blockchain: str) -> None:
         'address': address,
         'blockchain': blockchain
     }
+    key = (address.lower(), blockchain)
     
     # Get current history from cookies
     history = load_search_history()
     
-    # Check if this address+blockchain combo already exists
-    existing_entries = [
-        i for i, entry in enumerate(history)
-        if entry['address'].lower() == address.lower() and entry['blockchain'] == blockchain
-    ]
-    
-    # If it exists, remove the old entry
-    if existing_entries:
-        history.pop(existing_entries[0])
+    # Replace any earlier search of this address+blockchain and move it to the front
+    history.pop(key, None)
+    history[key] = new_entry
+    history.move_to_end(key, last=False)
     
-    # Add the new entry at the beginning of the list
-    history.insert(0, new_entry)
-    
-    # Limit history to last 100 searches
-    if len(history) > 100:
-        history = history[:100]
+    # Drop the oldest searches beyond the limit
+    while len(history) > SEARCH_HISTORY_LIMIT:
+        history.popitem(last=True)
     
     # Save updated history to cookies
     save_search_history(history)
 
 
-
-
-# Custom CSS
-st.markdown("""
-    <style>
-    .main-header {
-        font-size: 2.5rem;
-        color: #102E50 !important;
-        text-align: center;
-        margin-bottom: 1rem;
-        font-weight: bold;
-    }
-    .sub-header {
-        font-size: 2.0rem;
-        color: #424242;
-        margin-bottom: 1rem;
-    }
-    .block-container {
-        padding: 2rem 1rem;
-    }
-    .info-box {
-        background-color: #f0f2f6;
-        border-radius: 10px;
-        padding: 1rem;
-        margin-bottom: 1rem;
-    }
-    .metric-card {
-        background-color: #ffffff;
-        border-radius: 10px;
-        box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
-        padding: 1.5rem;
-        margin-bottom: 1rem;
-    }
-    .warning-tag {
-        background-color: #ffcdd2;
-        color: #b71c1c;
-        padding: 2px 6px;
-        border-radius: 4px;
-        font-size: 0.8rem;
-        font-weight: bold;
-    }
-    .history-item {
-        padding: 8px;
-        margin: 4px 0;
-        border-radius: 4px;
-        background-color: #f5f5f5;
-        cursor: pointer;
-    }
-    .history-item:hover {
-        background-color: #e0e0e0;
-    }
-    .history-timestamp {
-        color: #757575;
-        font-size: 0.8rem;
-    }
-    .history-address {
-        font-weight: bold;
-    }
-    .history-blockchain {
-        color: #1E88E5;
-        font-size: 0.9rem;
-    }
-    .search-container {
-        background-color: #ffffff;
-        padding: 2rem;
-        border-radius: 10px;
-        box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-        margin-bottom: 2rem;
-    }
-    .search-title {
-        color: #1E3A8A;
-        font-size: 1.2rem;
-        margin-bottom: 1rem;
-    }
-    .dataframe-container {
-        background-color: white;
-        padding: 1rem;
-        border-radius: 8px;
-        box-shadow: 0 2px 4px rgba(0,0,0,0.05);
-    }
-    .header-container {
-        display: flex;
-        justify-content: space-between;
-        align-items: center;
-        margin-bottom: 1rem;
-    }
-    .page-selector {
-        width: 100px;
-        float: right;
-    }
-    </style>
-""", unsafe_allow_html=True)
+# Status/detail cell colors for the result tables
+HIGH_RISK_COLOR = "#b71c1c"
+SAFE_COLOR = "#2e7d32"
+CAUTION_COLOR = "#FFD700"
+FRAUD_TYPES = ["Fake Stablecoin", "Fake Native", "Phishing"]
+BADGE_CSS = "background-color: {color}; color: white"
+HIGH_RISK_CSS = BADGE_CSS.format(color=HIGH_RISK_COLOR)
+SAFE_CSS = BADGE_CSS.format(color=SAFE_COLOR)
+CAUTION_CSS = BADGE_CSS.format(color=CAUTION_COLOR)
+
+def detail_cell_css(details: pd.Series) -> np.ndarray:
+    """Red cells for known fraud types, unstyled otherwise."""
+    return np.where(details.isin(FRAUD_TYPES), HIGH_RISK_CSS, "")
+
+# Recent transfers render as one table
+RECENT_TRANSFER_COLUMNS = {
+    "tx_hash": "Tx Hash",
+    "contract_address": "Contract Address",
+    "from_address": "From Address",
+    "to_address": "To Address",
+    "symbol": "Symbol",
+    "block_timestamp": "Block Timestamp",
+    "tag": "Status",
+    "tag_1": "Detail"
+}
+
+def style_recent_transfers(page: pd.DataFrame) -> Any:
+    """Return a Styler for a page of recent transfers with colored Status and Detail cells."""
+    # Safe matches are green, any other non-Caution status is high risk, the rest caution
+    status = page["tag"].astype(object)
+    safe = page["safe"].to_numpy(dtype=bool)
+    is_high_risk = (status.notna() & status.ne("") & status.ne("Caution")).to_numpy()
+    status_css = np.select([safe, is_high_risk], [SAFE_CSS, HIGH_RISK_CSS], CAUTION_CSS)
+    detail_css = detail_cell_css(page["tag_1"])
+    table = page[list(RECENT_TRANSFER_COLUMNS)].rename(columns=RECENT_TRANSFER_COLUMNS)
+    return table.style \
+        .apply(lambda _: status_css, subset=["Status"]) \
+        .apply(lambda _: detail_css, subset=["Detail"])
+
+# High risk tokens render as one table too; missing directory fields show as blanks
+HIGH_RISK_TOKEN_COLUMNS = {
+    "contract_address": "Contract Address",
+    "name": "Name",
+    "symbol": "Symbol",
+    "created_block_timestamp": "Created Blocktime",
+    "tag": "Status",
+    "tag_1": "Detail"
+}
+
+def style_high_risk_tokens(page: pd.DataFrame) -> Any:
+    """Return a Styler for a page of high risk tokens with colored Status and Detail cells."""
+    # Statuses match case-insensitively; blank statuses count as caution
+    status = page["tag"].astype(object).str.lower()
+    status_css = np.select(
+        [status.eq("safe").to_numpy(), (status.isna() | status.eq("") | status.eq("caution")).to_numpy()],
+        [SAFE_CSS, CAUTION_CSS],
+        HIGH_RISK_CSS
+    )
+    detail_css = detail_cell_css(page["tag_1"])
+    table = page.reindex(columns=list(HIGH_RISK_TOKEN_COLUMNS), fill_value='').rename(columns=HIGH_RISK_TOKEN_COLUMNS)
+    return table.style \
+        .apply(lambda _: status_css, subset=["Status"]) \
+        .apply(lambda _: detail_css, subset=["Detail"])
+
+# Chart figures depend only on the (small) result frames, so build each one once and reuse it across reruns
+# Cached as plain figure dicts with the same bounds as get_search_results, so old searches are evicted
+@st.cache_data(ttl=600, max_entries=64, show_spinner=False)
+def build_fraud_type_figure(tag_df: pd.DataFrame) -> Dict[str, Any]:
+    """Horizontal stacked bar of the share of affected tokens per fraud type, as a figure dict."""
+    # Custom palette: #102E50, #BE3D2A, #F5C45E
+    palette = ['#102E50', '#BE3D2A', '#F5C45E']
+    # One trace per tag from a single call, all stacked on the same category
+    fig = px.bar(
+        tag_df.assign(axis="Fraud Types"),
+        x="percent",
+        y="axis",
+        color="tag",
+        orientation="h",
+        color_discrete_sequence=palette
+    )
+    fig.update_traces(hovertemplate="%{fullData.name}: %{x}%<extra></extra>", showlegend=True)
+    fig.update_layout(
+        barmode='stack',
+        height=120,
+        margin=dict(l=20, r=20, t=30, b=10),  # Adjusted top margin
+        xaxis=dict(range=[0, 100], showgrid=False, showticklabels=False, title=None),
+        yaxis=dict(showticklabels=False, showgrid=False, title=None),
+        legend_title_text=None,
+        plot_bgcolor='#f8fafc',
+        paper_bgcolor='#f8fafc',
+        legend=dict(orientation='h', yanchor='bottom', y=1.02, xanchor='center', x=0.5)
+    )
+    return fig.to_dict()
+
+@st.cache_data(ttl=600, max_entries=64, show_spinner=False)
+def build_timeline_figure(timeline: pd.DataFrame, trace_names: Dict[str, str], palette: List[str], y_title: str) -> Dict[str, Any]:
+    """Grouped daily bar chart with one trace per timeline column, named by trace_names, as a figure dict."""
+    # Both result builders index timelines by datetime64 days, so format the labels in one call
+    x_labels = timeline.index.strftime('%Y-%m-%d').tolist()
+    fig = go.Figure()
+    for color, (column, name) in zip(palette, trace_names.items()):
+        fig.add_trace(go.Bar(
+            x=x_labels,
+            y=timeline[column],
+            name=name,
+            marker_color=color,
+            hovertemplate=f"{name}: %{{y}}<br>Date: %{{x}}<extra></extra>"
+        ))
+    fig.update_layout(
+        barmode='group',
+        height=260,
+        margin=dict(l=20, r=20, t=10, b=30),
+        xaxis=dict(title='Date', tickangle=-45, tickfont=dict(size=10)),
+        yaxis=dict(title=y_title, gridcolor='rgba(30,41,59,0.08)'),
+        plot_bgcolor='#f8fafc',
+        paper_bgcolor='#f8fafc',
+        legend=dict(orientation='h', yanchor='bottom', y=1.1, xanchor='center', x=0.5)
+    )
+    return fig.to_dict()
 
 
 
@@ -454,120 +742,179 @@ with right_col:
 
 
 
+# Shared alchemy_getAssetTransfers filter: last 100 ERC-20 transfers, newest first
+ASSET_TRANSFERS_PARAMS = {
+    "fromBlock": "0x0",
+    "toBlock": "latest",
+    "maxCount": "0x64",
+    "excludeZeroValue": False,
+    "category": ["erc20"],
+    "withMetadata": True,
+    "order": "desc"
+}
+
+def asset_transfers_payload(**address_filter: str) -> Dict[str, Any]:
+    """Build a JSON-RPC payload from the shared filter plus a fromAddress/toAddress filter."""
+    return {
+        "jsonrpc": "2.0",
+        "id": 1,
+        "method": "alchemy_getAssetTransfers",
+        "params": [{**ASSET_TRANSFERS_PARAMS, **address_filter}]
+    }
+
+# One keep-alive session for all Alchemy JSON-RPC calls, so repeat searches skip the TCP/TLS handshake
+ALCHEMY_TIMEOUT = 60  # seconds
+
+@st.cache_resource
+def get_alchemy_session() -> requests.Session:
+    session = requests.Session()
+    session.mount("https://", requests.adapters.HTTPAdapter(pool_connections=8, pool_maxsize=8))
+    session.headers.update({"Connection": "keep-alive"})
+    return session
+
+# Alchemy endpoints by blockchain name, built once from the .env API key
+dotenv.load_dotenv(".env")
+ALCHEMY_API_KEY = os.getenv("ALCHEMY_API_KEY")
+ALCHEMY_NETWORKS = {
+    "ethereum": "eth-mainnet",
+    "polygon": "polygon-mainnet",
+    "arbitrum": "arb-mainnet",
+    "optimism": "opt-mainnet",
+    "blast": "blast-mainnet",
+    "base": "base-mainnet",
+    "bsc": "bnb-mainnet",
+    "binance": "bnb-mainnet",
+    "binance smart chain": "bnb-mainnet",
+    "binance-smart-chain": "bnb-mainnet",
+}
+ALCHEMY_URLS = {
+    chain: f"https://{network}.g.alchemy.com/v2/{ALCHEMY_API_KEY}"
+    for chain, network in ALCHEMY_NETWORKS.items()
+}
+
+@st.cache_resource
+def get_web3(alchemy_url: str) -> Web3:
+    """One Web3 client per endpoint, riding on the shared Alchemy session."""
+    return Web3(Web3.HTTPProvider(alchemy_url, session=get_alchemy_session()))
+
+# Low-cardinality columns of the fetched transfers, stored as categoricals
+TRANSFER_CATEGORY_DTYPES = {'contract_address': 'category', 'symbol': 'category', 'blockchain': 'category'}
+
 # Function to get token transfers data using your updated SQL query
 def get_token_transfers(address_searched: str, blockchain: str) -> pd.DataFrame:
     """Fetch the last 100 ERC-20 token transfers for an address using Alchemy's enhanced API."""
     try:
-        dotenv.load_dotenv(".env")
-        ALCHEMY_API_KEY = os.getenv("ALCHEMY_API_KEY")
         # Map blockchain to Alchemy URL
         blockchain = blockchain.lower()
-        if blockchain == "ethereum":
-            ALCHEMY_URL = f"https://eth-mainnet.g.alchemy.com/v2/{ALCHEMY_API_KEY}"
-        elif blockchain == "polygon":
-            ALCHEMY_URL = f"https://polygon-mainnet.g.alchemy.com/v2/{ALCHEMY_API_KEY}"
-        elif blockchain == "arbitrum":
-            ALCHEMY_URL = f"https://arb-mainnet.g.alchemy.com/v2/{ALCHEMY_API_KEY}"
-        elif blockchain == "optimism":
-            ALCHEMY_URL = f"https://opt-mainnet.g.alchemy.com/v2/{ALCHEMY_API_KEY}"
-        elif blockchain == "blast":
-            ALCHEMY_URL = f"https://blast-mainnet.g.alchemy.com/v2/{ALCHEMY_API_KEY}"
-        elif blockchain == "base":
-            ALCHEMY_URL = f"https://base-mainnet.g.alchemy.com/v2/{ALCHEMY_API_KEY}"
-        elif blockchain in ["bsc", "binance", "binance smart chain", "binance-smart-chain"]:
-            ALCHEMY_URL = f"https://bnb-mainnet.g.alchemy.com/v2/{ALCHEMY_API_KEY}"
-        else:
+        ALCHEMY_URL = ALCHEMY_URLS.get(blockchain)
+        if ALCHEMY_URL is None:
             st.warning(f"Blockchain '{blockchain}' not recognized. Defaulting to Ethereum mainnet.")
-            ALCHEMY_URL = f"https://eth-mainnet.g.alchemy.com/v2/{ALCHEMY_API_KEY}"
+            ALCHEMY_URL = ALCHEMY_URLS["ethereum"]
             blockchain = "ethereum"
-        web3 = Web3(Web3.HTTPProvider(ALCHEMY_URL))
+        web3 = get_web3(ALCHEMY_URL)
         if not web3.is_connected():
-            st.error(f"Connection to {blockchain.title()} blockchain failed!")
-            return pd.DataFrame()
+            raise ConnectionError(f"Connection to {blockchain.title()} blockchain failed!")
         else:
-            print(f"Connected to {blockchain.title()} blockchain")
+            logger.debug("Connected to %s blockchain", blockchain.title())
 
         ADDRESS = address_searched
         seven_days_ago = int((datetime.now() - timedelta(days=7)).timestamp())
-        payload = {
-            "jsonrpc": "2.0",
-            "id": 1,
-            "method": "alchemy_getAssetTransfers",
-            "params": [
-                {
-                    "fromBlock": "0x0",
-                    "toBlock": "latest",
-                    "maxCount": "0x64",
-                    "excludeZeroValue": False,
-                    "category": ["erc20"],
-                    "fromAddress": ADDRESS,
-                    "withMetadata": True,
-                    "order": "desc"
-                }
-            ]
-        }
-        print(f"Fetching outgoing ERC-20 transfers for {ADDRESS} on {blockchain.title()}...")
-        response = requests.post(ALCHEMY_URL, json=payload)
-        outgoing_transfers = []
-        if response.status_code == 200:
-            data = response.json()
+        session = get_alchemy_session()
+
+        def fetch_transfers(direction: str, address_filter: Dict[str, str]) -> List[Tuple[int, Dict[str, Any]]]:
+            payload = asset_transfers_payload(**address_filter)
+            logger.debug("Fetching %s ERC-20 transfers for %s on %s", direction, ADDRESS, blockchain.title())
+            response = session.post(ALCHEMY_URL, json=payload, timeout=ALCHEMY_TIMEOUT)
+            # A failed arm raises: returning only the other arm's transfers would look like a complete search
+            if response.status_code != 200:
+                logger.warning("Error fetching %s transfers: %s %s", direction, response.status_code, response.text)
+                raise RuntimeError(f"Alchemy returned HTTP {response.status_code} for {direction} transfers")
+            data = orjson.loads(response.content)
+            if "error" in data:
+                raise RuntimeError(f"Alchemy error for {direction} transfers: {data['error']}")
             if "result" in data and "transfers" in data["result"]:
-                outgoing_transfers = data["result"]["transfers"]
+                # Parse each hex block number once; it is both the merge key and the block_number column
+                return [(int(tx.get("blockNum", "0x0"), 16), tx) for tx in data["result"]["transfers"]]
+            return []
+
+        # Outgoing and incoming transfers are independent requests, so issue them concurrently
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            outgoing_future = executor.submit(fetch_transfers, "outgoing", {"fromAddress": ADDRESS})
+            incoming_future = executor.submit(fetch_transfers, "incoming", {"toAddress": ADDRESS})
+            outgoing_transfers = outgoing_future.result()
+            incoming_transfers = incoming_future.result()
+
+        # Each arm is already capped at maxCount and ordered newest first, so merge them
+        # lazily and stop after the 100 most recent instead of concatenating and re-sorting
+        merged_transfers = heapq.merge(
+            outgoing_transfers, incoming_transfers,
+            key=lambda numbered: numbered[0], reverse=True
+        )
+        numbered_transfers = list(itertools.islice(
+            ((block_number, tx) for block_number, tx in merged_transfers if tx.get("metadata", {}).get("blockTimestamp", "")), 100
+        ))
+        all_transfers = [tx for _, tx in numbered_transfers]
 
-        else:
-            print(f"Error fetching outgoing transfers: {response.status_code} {response.text}")
-
-        # Now fetch incoming transfers
-        payload["params"][0].pop("fromAddress", None)
-        payload["params"][0]["toAddress"] = ADDRESS
-        print(f"Fetching incoming ERC-20 transfers for {ADDRESS} on {blockchain.title()}...")
-        response = requests.post(ALCHEMY_URL, json=payload)
-        incoming_transfers = []
-        if response.status_code == 200:
-            data = response.json()
-            if "result" in data and "transfers" in data["result"]:
-                incoming_transfers = data["result"]["transfers"]
+        # Build the frame column by column, parsing every block timestamp in one vectorized call
+        block_datetimes = pd.to_datetime(
+            [tx["metadata"]["blockTimestamp"] for tx in all_transfers], format='ISO8601', utc=True
+        )
+        transfers_df = pd.DataFrame({
+            "block_number": np.array([block_number for block_number, _ in numbered_transfers], dtype=np.int64),
+            "timestamp": np.asarray((block_datetimes - pd.Timestamp(0, tz='UTC')) // pd.Timedelta(seconds=1), dtype=np.int64),
+            "tx_hash": [tx.get("hash", "") for tx in all_transfers],
+            "contract_address": [tx.get("rawContract", {}).get("address", "") for tx in all_transfers],
+            "symbol": [tx.get("asset", "") for tx in all_transfers],
+            "from_address": [tx.get("from", "") for tx in all_transfers],
+            "to_address": [tx.get("to", "") for tx in all_transfers],
+            "amount": np.array([tx.get("value", 0) for tx in all_transfers], dtype=np.float64),
+            "block_timestamp": np.asarray(block_datetimes.strftime('%Y-%m-%d %H:%M:%S'), dtype=object),
+            "blockchain": blockchain
+        })
 
-        else:
-            print(f"Error fetching incoming transfers: {response.status_code} {response.text}")
-
-        # Combine and process all transfers
-        all_transfers = outgoing_transfers + incoming_transfers
-        all_transfers.sort(key=lambda x: int(x.get("blockNum", "0x0"), 16), reverse=True)
-        processed_transfers = []
-        for tx in all_transfers:
-            block_timestamp_str = tx.get("metadata", {}).get("blockTimestamp", "")
-            if not block_timestamp_str:
-                continue
-            block_datetime = parser.isoparse(block_timestamp_str)
-            block_timestamp = int(block_datetime.timestamp())
-            if block_timestamp >= seven_days_ago:
-                processed_transfers.append({
-                    "block_number": int(tx.get("blockNum", "0x0"), 16),
-                    "timestamp": block_timestamp,
-                    "tx_hash": tx.get("hash", ""),
-                    "contract_address": tx.get("rawContract", {}).get("address", ""),
-                    "symbol": tx.get("asset", ""),
-                    "from_address": tx.get("from", ""),
-                    "to_address": tx.get("to", ""),
-                    "amount": float(tx.get("value", 0)),
-                    "block_timestamp": block_datetime.strftime('%Y-%m-%d %H:%M:%S')
-                })
-                if len(processed_transfers) >= 100:
-                    break
-        # Add blockchain column
-        for tx in processed_transfers:
-            tx["blockchain"] = blockchain
-
-        transfers_df = pd.DataFrame(processed_transfers)
-        # DEBUG: Print a sample of from_address and to_address values
-        print("Sample from_address and to_address values:")
-        print(transfers_df[["from_address", "to_address"]].head(10))
+        # Keep the 100 most recent transfers from the last seven days
+        transfers_df = transfers_df[transfers_df["timestamp"] >= seven_days_ago].head(100).reset_index(drop=True)
+        # Lowercase contract addresses once so they match the token directories
+        transfers_df["contract_address"] = transfers_df["contract_address"].str.lower()
+        # Few distinct contracts, symbols and a single chain per search: store them as categoricals
+        transfers_df = transfers_df.astype(TRANSFER_CATEGORY_DTYPES)
         return transfers_df
     except Exception as e:
-        st.error(f"Error fetching token transfers: {str(e)}")
-        return pd.DataFrame()  # Return empty DataFrame on error
-
+        # Re-raise as a RuntimeError so the search handler reports the outage instead of treating
+        # it as "no transactions" (KeyError is a LookupError) or an analysis failure (ValueError)
+        logger.exception("Error fetching token transfers")
+        raise RuntimeError(f"Error fetching token transfers: {str(e)}") from e
+
+
+# Recent transfers are kept as a DataFrame with their repeated labels as categoricals
+RECENT_TRANSFER_DTYPES = {'symbol': 'category', 'tag': 'category', 'tag_1': 'category'}
+
+def count_tokens_by_tag(matches: pd.DataFrame, total_tokens: int) -> pd.DataFrame:
+    """Unique tokens per tag_1 and their share of total_tokens, as a float percent, sorted by tag."""
+    # Each (contract, tag_1) pair counts once, so a plain value_counts gives unique tokens per tag
+    counts = matches[['contract_address', 'tag_1']].drop_duplicates()['tag_1'].value_counts(sort=False)
+    # Categorical tags also report unused categories, keep only the tags that occur
+    tags = counts[counts > 0].sort_index().rename_axis('tag').reset_index(name='count')
+    tags['percent'] = (tags['count'].to_numpy(dtype=np.float64) / max(total_tokens, 1) * 100).round(1)
+    return tags
+
+def build_daily_timeline(dates, contracts: pd.Series, is_suspicious: np.ndarray) -> pd.DataFrame:
+    """Per-day transfer and unique-token counts, all and suspicious, indexed by sorted date."""
+    # Factorize once and tally with bincount instead of a python-level groupby
+    date_codes, days = pd.factorize(dates, sort=True)
+    contract_codes, contracts_seen = pd.factorize(contracts)
+    n_days, n_contracts = len(days), max(len(contracts_seen), 1)
+    # Unique (day, contract) pairs as one int64 key; rows without a contract are not counted as tokens
+    has_contract = contract_codes >= 0
+    pair_keys = date_codes.astype(np.int64) * n_contracts + contract_codes
+    all_pairs = np.unique(pair_keys[has_contract])
+    suspicious_pairs = np.unique(pair_keys[has_contract & is_suspicious])
+    return pd.DataFrame({
+        'All Transfers': np.bincount(date_codes, minlength=n_days),
+        'Suspicious Transfers': np.bincount(date_codes[is_suspicious], minlength=n_days),
+        'All Tokens': np.bincount(all_pairs // n_contracts, minlength=n_days),
+        'Suspicious Tokens': np.bincount(suspicious_pairs // n_contracts, minlength=n_days)
+    }, index=pd.Index(days, name='date'))
 
 # Function to analyze token transfers data including suspicious activity
 def analyze_transfers_data(transfers_df):
@@ -575,6 +922,10 @@ def analyze_transfers_data(transfers_df):
         return None
    
     try:
+        # Day of each transfer, computed once as datetime64 so the suspicious/safe subsets inherit it
+        # Derived from the epoch seconds get_token_transfers already parsed, not by re-parsing strings
+        transfers_df['date'] = transfers_df['timestamp'].to_numpy(dtype='int64').astype('datetime64[s]').astype('datetime64[D]')
+
         # Identify suspicious transfers
         suspicious_transfers = identify_suspicious_transfers(transfers_df)
         suspicious_count = len(suspicious_transfers) if not suspicious_transfers.empty else 0 #number of suspicious transfers
@@ -583,134 +934,84 @@ def analyze_transfers_data(transfers_df):
         safe_transfers = identify_safe_transfers(transfers_df)
         safe_count = len(safe_transfers) if not safe_transfers.empty else 0 #number of safe transfers
    
-        # --- Compute activity timeline for all and suspicious transfers ---
-        transfers_df['date'] = pd.to_datetime(transfers_df['block_timestamp']).dt.date
-        all_counts = transfers_df.groupby('date').size().reset_index(name='All Transfers')
-        if not suspicious_transfers.empty:
-            suspicious_transfers['date'] = pd.to_datetime(suspicious_transfers['block_timestamp']).dt.date
-            suspicious_counts = suspicious_transfers.groupby('date').size().reset_index(name='Suspicious Transfers')
-        else:
-            suspicious_counts = pd.DataFrame(columns=['date', 'Suspicious Transfers'])
-        activity_timeline = pd.merge(all_counts, suspicious_counts, on='date', how='left').fillna(0)
-        activity_timeline = activity_timeline.set_index('date').sort_index()
-
-        # --- Compute unique tokens timeline for all and suspicious transfers ---
-        tokens_all = transfers_df.groupby('date')['contract_address'].nunique().reset_index(name='All Tokens')
-        if not suspicious_transfers.empty:
-            tokens_suspicious = suspicious_transfers.groupby('date')['contract_address'].nunique().reset_index(name='Suspicious Tokens')
-        else:
-            tokens_suspicious = pd.DataFrame(columns=['date', 'Suspicious Tokens'])
-        tokens_timeline = pd.merge(tokens_all, tokens_suspicious, on='date', how='left').fillna(0)
-        tokens_timeline = tokens_timeline.set_index('date').sort_index()
+        # --- Compute activity and unique tokens timelines in one counting pass ---
+        # tag_transfers keeps the original index, so suspicious rows are flagged by index
+        is_suspicious = transfers_df.index.isin(suspicious_transfers.index)
+        timeline = build_daily_timeline(transfers_df['date'], transfers_df['contract_address'], is_suspicious)
+        activity_timeline = timeline[['All Transfers', 'Suspicious Transfers']]
+        tokens_timeline = timeline[['All Tokens', 'Suspicious Tokens']]
 
         # Get total number of transfers
         total_transfers = len(transfers_df) #total number of transfers in protocol for the last seven days
-   
 
-        # Get unique tokens
-        unique_tokens = transfers_df['contract_address'].nunique()
-   
-        # Get top tokens by transfer count
-        top_tokens = transfers_df['contract_address'].value_counts().head(5).to_dict()
-   
-        # Get first and last activity dates
-        first_activity = transfers_df['block_timestamp'].min() #This is the first transfers identified
-        last_activity = transfers_df['block_timestamp'].max() #This is the last transfers identified
+        # Get unique tokens and top tokens by transfer count from a single value_counts pass
+        token_counts = transfers_df['contract_address'].value_counts()
+        unique_tokens = len(token_counts)
+        top_tokens = token_counts.head(5).to_dict()
    
         # Get recent transfers (include suspicious and safe tags if applicable)
         recent_transfers = transfers_df.sort_values('block_timestamp', ascending=False)
-        recent_transfers_list = []
-   
-        for _, row in recent_transfers.iterrows():
-            # Check if this transfer is in suspicious_transfers
-            is_suspicious = False
-            is_safe = False
-            tag = None
-            tag_1 = None
-       
-            if not suspicious_transfers.empty:
-                suspicious_match = suspicious_transfers[
-                    (suspicious_transfers['tx_hash'] == row['tx_hash']) &
-                    (suspicious_transfers['contract_address'] == row['contract_address'])
-                ]
-                if not suspicious_match.empty:
-                    is_suspicious = True
-                    tag = suspicious_match.iloc[0]['tag']
-                    # Safely get tag_1 if it exists
-                    if 'tag_1' in suspicious_match.columns:
-                        tag_1 = suspicious_match.iloc[0]['tag_1']
-            
-            # Check if this transfer is in safe_transfers
-            if not safe_transfers.empty and not is_suspicious:
-                safe_match = safe_transfers[
-                    (safe_transfers['tx_hash'] == row['tx_hash']) &
-                    (safe_transfers['contract_address'] == row['contract_address'])
-                ]
-                if not safe_match.empty:
-                    is_safe = True
-                    tag = safe_match.iloc[0]['tag']
-                    # Safely get tag_1 if it exists
-                    if 'tag_1' in safe_match.columns:
-                        tag_1 = safe_match.iloc[0]['tag_1']
-           
-            recent_transfers_list.append({
-                "tx_hash": str(row['tx_hash']),  # Full, no shortening
-                "contract_address": str(row['contract_address']),  # Full, no shortening
-                "from_address": row.get('from_address', ''),
-                "to_address": row.get('to_address', ''),
-                "symbol": row['symbol'] if pd.notna(row['symbol']) else "Unknown",
-                # Robustly handle both string and datetime for block_timestamp
-                "block_timestamp": row['block_timestamp'],
-                "time": parser.parse(row['block_timestamp']).strftime('%Y-%m-%d %H:%M:%S') if isinstance(row['block_timestamp'], str) else row['block_timestamp'].strftime('%Y-%m-%d %H:%M:%S'),
-                "suspicious": is_suspicious,
-                "safe": is_safe,
-                "tag": tag if tag else "Caution",
-                "tag_1": tag_1 if tag_1 else "No Detail"
-            })
-       
+
+        # Attach the suspicious and safe tags with one left merge each on (tx_hash, contract_address)
+        tag_keys = ['tx_hash', 'contract_address']
+        def tag_columns(matches, name):
+            if matches.empty:
+                return pd.DataFrame(columns=tag_keys + [name, f'{name}_tag', f'{name}_tag_1'])
+            return matches[tag_keys + ['tag', 'tag_1']] \
+                .drop_duplicates(subset=tag_keys) \
+                .rename(columns={'tag': f'{name}_tag', 'tag_1': f'{name}_tag_1'}) \
+                .assign(**{name: True})
+        recent = recent_transfers \
+            .merge(tag_columns(suspicious_transfers, 'suspicious'), on=tag_keys, how='left') \
+            .merge(tag_columns(safe_transfers, 'safe'), on=tag_keys, how='left')
+
+        # Suspicious matches take precedence over safe ones
+        # The two sides' tag categories differ, so pick between them on plain values
+        is_suspicious = recent['suspicious'].notna().to_numpy()
+        is_safe = ~is_suspicious & recent['safe'].notna().to_numpy()
+        tag = recent['suspicious_tag'].astype(object).where(is_suspicious, recent['safe_tag'].astype(object).where(is_safe))
+        tag_1 = recent['suspicious_tag_1'].astype(object).where(is_suspicious, recent['safe_tag_1'].astype(object).where(is_safe))
+        recent_transfers = pd.DataFrame({
+            "tx_hash": recent['tx_hash'],  # Full, no shortening
+            "contract_address": recent['contract_address'],  # Full, no shortening
+            "from_address": recent['from_address'],
+            "to_address": recent['to_address'],
+            # "Unknown" is usually not among the fetched symbol categories, fill on plain values
+            "symbol": recent['symbol'].astype(object).fillna("Unknown"),
+            "block_timestamp": recent['block_timestamp'],
+            # block_timestamp is already formatted as '%Y-%m-%d %H:%M:%S' by get_token_transfers
+            "time": recent['block_timestamp'],
+            "suspicious": is_suspicious,
+            "safe": is_safe,
+            # Unmatched or blank tags fall back to the display defaults
+            "tag": tag.where(tag.notna() & tag.ne(""), "Caution"),
+            "tag_1": tag_1.where(tag_1.notna() & tag_1.ne(""), "No Detail")
+        }).astype(RECENT_TRANSFER_DTYPES)
+
         # Calculate suspicious token metrics
         if not suspicious_transfers.empty:
-            suspicious_tokens = suspicious_transfers['contract_address'].nunique()  # Number of unique suspicious tokens
+            # One row per token (first occurrence) for the High Risk Tokens table, also giving the token count
+            suspicious_transfers_unique = suspicious_transfers.drop_duplicates(subset=['contract_address'])
+            suspicious_tokens = len(suspicious_transfers_unique)  # Number of unique suspicious tokens
+            suspicious_senders = suspicious_transfers['from_address'].nunique()
             
-            # Debug print to check columns
-            print("Suspicious transfers columns:", suspicious_transfers.columns.tolist())
-            
-            # Calculate suspicious_tags dynamically
-            suspicious_tags = (
-                suspicious_transfers
-                .groupby('tag_1')['contract_address']
-                .nunique()
-                .reset_index()
-                .rename(columns={'contract_address': 'count', 'tag_1': 'tag'})
-            )
-            total_suspicious_tokens = suspicious_transfers['contract_address'].nunique()
-            suspicious_tags['percent'] = (suspicious_tags['count'] / total_suspicious_tokens * 100).round(1) if total_suspicious_tokens else 0
+            suspicious_tags = count_tokens_by_tag(suspicious_transfers, suspicious_tokens)
         else:
             suspicious_tokens = 0
+            suspicious_senders = 0
             suspicious_tags = pd.DataFrame(columns=['tag', 'count', 'percent'])
+            suspicious_transfers_unique = suspicious_transfers
 
         # Calculate safe token metrics
         if not safe_transfers.empty:
             safe_tokens = safe_transfers['contract_address'].nunique()  # Number of unique safe tokens
+            safe_senders = safe_transfers['from_address'].nunique()
             
-            # Debug print to check columns
-            print("Safe transfers columns:", safe_transfers.columns.tolist())
-            
-            # Safely handle tag_1 grouping
-            if 'tag_1' in safe_transfers.columns:
-                safe_tags = safe_transfers.groupby('tag_1')['contract_address'].nunique().reset_index()
-                safe_tags.columns = ['tag', 'count']
-                # For stacked bar: get percentage per tag
-                safe_tags['percent'] = safe_tags['count'] / safe_tokens * 100
-            else:
-                # If tag_1 doesn't exist, create a default DataFrame
-                safe_tags = pd.DataFrame({
-                    'tag': ['Unknown'],
-                    'count': [safe_tokens],
-                    'percent': [100.0]
-                })
+            # tag_1 is always there: it is one of SAFE_TOKEN_FIELDS and the loader defaults it
+            safe_tags = count_tokens_by_tag(safe_transfers, safe_tokens)
         else:
             safe_tokens = 0
+            safe_senders = 0
             safe_tags = pd.DataFrame(columns=['tag', 'count', 'percent'])
    
         return {
@@ -719,16 +1020,17 @@ def analyze_transfers_data(transfers_df):
                 "unique_tokens": unique_tokens,
                 "suspicious_count": suspicious_count,
                 "suspicious_tokens": suspicious_tokens,
-                "suspicious_senders": len(suspicious_transfers["from_address"].unique()) if not suspicious_transfers.empty else 0,
+                "suspicious_senders": suspicious_senders,
                 "safe_count": safe_count,
                 "safe_tokens": safe_tokens,
-                "safe_senders": len(safe_transfers["from_address"].unique()) if not safe_transfers.empty else 0,
+                "safe_senders": safe_senders,
             },
             "top_tokens": top_tokens,
             "activity_timeline": activity_timeline,
             "tokens_timeline": tokens_timeline,
-            "recent_transfers": recent_transfers_list,
+            "recent_transfers": recent_transfers,
             "suspicious_transfers": suspicious_transfers,
+            "suspicious_transfers_unique": suspicious_transfers_unique,
             "suspicious_tags": suspicious_tags,
             "safe_transfers": safe_transfers,
             "safe_tags": safe_tags,
@@ -736,16 +1038,20 @@ def analyze_transfers_data(transfers_df):
         }
     except Exception as e:
         st.error(f"Error analyzing transfers data: {str(e)}")
-        # Add more detailed error information
-        import traceback
-        st.error(f"Detailed error: {traceback.format_exc()}")
+        # Full traceback to the logs rather than the page
+        logger.exception("Error analyzing transfers data")
         return None
 
 
 
 
-# Show mock data for development/testing
-def get_mock_data():
+# Low-cardinality label columns of the mock transfers, stored as categoricals
+MOCK_CATEGORY_DTYPES = {'blockchain': 'category', 'symbol': 'category', 'tag': 'category', 'tag_1': 'category'}
+
+# Static part of the mock data: none of it depends on the current time
+# Built once per hour and shared by reference: session state stores it as-is and the dashboard only reads it
+@st.cache_resource(ttl=3600, show_spinner=False)
+def get_static_mock_data():
     # Each contract_address has only one tag_1 (fraud type)
     mock_suspicious_transfers = pd.DataFrame({
         "tx_hash": [
@@ -840,7 +1146,7 @@ def get_mock_data():
             "Phishing", "Phishing",
             "Fake Stablecoin"
         ]
-    })
+    }).astype(MOCK_CATEGORY_DTYPES)
 
     # Create mock safe transfers
     mock_safe_transfers = pd.DataFrame({
@@ -852,48 +1158,39 @@ def get_mock_data():
         "from_address": ["0xaaa...111", "0xaaa...222", "0xaaa...333"],
         "tag": ["Safe", "Safe", "Safe"],
         "tag_1": ["No Detail", "No Detail", "No Detail"]
-    })
+    }).astype(MOCK_CATEGORY_DTYPES)
    
-    # Combine all mock transfers for total and unique calculations
-    all_transfers = pd.concat([mock_suspicious_transfers, mock_safe_transfers], ignore_index=True)
-
+    # Combine all mock transfers for total and unique calculations, copying only the columns read below
+    combined_columns = ['tx_hash', 'block_timestamp', 'contract_address', 'tag']
+    all_transfers = pd.concat(
+        [mock_suspicious_transfers[combined_columns], mock_safe_transfers[combined_columns]],
+        ignore_index=True
+    )
 
     # Calculate summary metrics dynamically
     total_transfers = len(all_transfers)
     unique_tokens = all_transfers['contract_address'].nunique()
     suspicious_count = len(mock_suspicious_transfers)
-    suspicious_tokens = mock_suspicious_transfers['contract_address'].nunique()
+    # One row per token (first occurrence) for the High Risk Tokens table, also giving the token count
+    mock_suspicious_unique = mock_suspicious_transfers.drop_duplicates(subset=['contract_address'])
+    suspicious_tokens = len(mock_suspicious_unique)
     suspicious_senders = mock_suspicious_transfers['from_address'].nunique()
     safe_count = len(mock_safe_transfers)
     safe_tokens = mock_safe_transfers['contract_address'].nunique()
     safe_senders = mock_safe_transfers['from_address'].nunique()
 
-    # --- Compute activity timeline for all and suspicious transfers ---
-    all_transfers['date'] = pd.to_datetime(all_transfers['block_timestamp']).dt.date
-    suspicious_transfers = mock_suspicious_transfers.copy()
-    suspicious_transfers['date'] = pd.to_datetime(suspicious_transfers['block_timestamp']).dt.date
-
-    all_counts = all_transfers.groupby('date').size().reset_index(name='All Transfers')
-    suspicious_counts = suspicious_transfers.groupby('date').size().reset_index(name='Suspicious Transfers')
-    activity_timeline = pd.merge(all_counts, suspicious_counts, on='date', how='left').fillna(0)
-    activity_timeline = activity_timeline.set_index('date').sort_index()
-
-    # --- Compute unique tokens timeline for all and suspicious transfers ---
-    tokens_all = all_transfers.groupby('date')['contract_address'].nunique().reset_index(name='All Tokens')
-    tokens_suspicious = suspicious_transfers.groupby('date')['contract_address'].nunique().reset_index(name='Suspicious Tokens')
-    tokens_timeline = pd.merge(tokens_all, tokens_suspicious, on='date', how='left').fillna(0)
-    tokens_timeline = tokens_timeline.set_index('date').sort_index()
+    # --- Compute activity and unique tokens timelines in one counting pass ---
+    timeline = build_daily_timeline(
+        # block_timestamp is already datetime64, so truncate it to the day without re-parsing
+        all_transfers['block_timestamp'].values.astype('datetime64[D]'),
+        all_transfers['contract_address'],
+        all_transfers['tag'].eq('High Risk').to_numpy()
+    )
+    activity_timeline = timeline[['All Transfers', 'Suspicious Transfers']]
+    tokens_timeline = timeline[['All Tokens', 'Suspicious Tokens']]
 
     # --- Compute suspicious tags (Tokens by Fraud Type) dynamically ---
-    suspicious_tags = (
-        mock_suspicious_transfers
-        .groupby('tag_1')['contract_address']
-        .nunique()
-        .reset_index()
-        .rename(columns={'contract_address': 'count', 'tag_1': 'tag'})
-    )
-    total_suspicious_tokens = suspicious_tokens
-    suspicious_tags['percent'] = (suspicious_tags['count'] / total_suspicious_tokens * 100).round(1) if total_suspicious_tokens else 0
+    suspicious_tags = count_tokens_by_tag(mock_suspicious_transfers, suspicious_tokens)
 
     return {
         "summary": {
@@ -915,35 +1212,8 @@ def get_mock_data():
         },
         "activity_timeline": activity_timeline,
         "tokens_timeline": tokens_timeline,
-        "recent_transfers": [
-            (
-                lambda tag, tx_hash, contract_address, time, from_address, to_address: {
-                    "tx_hash": tx_hash,
-                    "contract_address": contract_address,
-                    "from_address": from_address,
-                    "to_address": to_address,
-                    "symbol": "ETH",
-                    "block_timestamp": time,
-                    "created_block_timestamp": (datetime.now() - timedelta(days=i)).strftime('%Y-%m-%d %H:%M:%S'),
-                    "suspicious": tag == "High Risk",
-                    "safe": tag == "Safe",
-                    "tag": tag,
-                    "tag_1": (
-                        random.choice(["Phishing", "Fake Native", "Fake Stablecoin"]) if tag == "High Risk" else "No Detail"
-                    )
-                }
-            )(
-                # tag assignment logic
-                ("High Risk" if i % 3 == 0 else ("Safe" if i % 3 == 1 else "Caution")),
-                f"0x{i}234...abcd",
-                f"0xc{i}23...4567",
-                (datetime.now() - timedelta(hours=i)).strftime('%Y-%m-%d %H:%M:%S'),
-                f"0xFrom{i:02d}...{i*7%100:02d}",
-                f"0xTo{i:02d}...{i*13%100:02d}"
-            )
-            for i in range(20)  # Create 20 mock transfers for testing
-        ],
         "suspicious_transfers": mock_suspicious_transfers,
+        "suspicious_transfers_unique": mock_suspicious_unique,
         "suspicious_tags": suspicious_tags,
         "safe_transfers": mock_safe_transfers,
         "safe_tags": pd.DataFrame({
@@ -961,6 +1231,53 @@ def get_mock_data():
         })
     }
 
+# Mock recent transfers, stamped relative to now on every call
+def build_mock_recent_transfers() -> pd.DataFrame:
+    # Build 20 mock recent transfers column by column
+    mock_index = pd.Series(np.arange(20))  # Create 20 mock transfers for testing
+    mock_i = mock_index.astype(str)
+    now = pd.Timestamp.now()
+    # Cycle through High Risk, Safe and Caution tags
+    mock_tags = np.select([mock_index % 3 == 0, mock_index % 3 == 1], ["High Risk", "Safe"], "Caution")
+    is_high_risk = mock_tags == "High Risk"
+    mock_recent_transfers = pd.DataFrame({
+        "tx_hash": "0x" + mock_i + "234...abcd",
+        "contract_address": "0xc" + mock_i + "23...4567",
+        "from_address": "0xFrom" + mock_i.str.zfill(2) + "..." + (mock_index * 7 % 100).astype(str).str.zfill(2),
+        "to_address": "0xTo" + mock_i.str.zfill(2) + "..." + (mock_index * 13 % 100).astype(str).str.zfill(2),
+        "symbol": "ETH",
+        "block_timestamp": (now - pd.to_timedelta(mock_index, unit='h')).dt.strftime('%Y-%m-%d %H:%M:%S'),
+        "created_block_timestamp": (now - pd.to_timedelta(mock_index, unit='D')).dt.strftime('%Y-%m-%d %H:%M:%S'),
+        "suspicious": is_high_risk,
+        "safe": mock_tags == "Safe",
+        "tag": mock_tags,
+        "tag_1": np.where(
+            is_high_risk,
+            np.random.choice(["Phishing", "Fake Native", "Fake Stablecoin"], size=len(mock_index)),
+            "No Detail"
+        )
+    })
+    return mock_recent_transfers.astype(RECENT_TRANSFER_DTYPES)
+
+# Show mock data for development/testing
+def get_mock_data():
+    """Cached static mock frames plus freshly timestamped recent transfers."""
+    return {**get_static_mock_data(), "recent_transfers": build_mock_recent_transfers()}
+
+# Fetch and analyze a search once per (address, blockchain) every ten minutes, shared across sessions
+# Empty and failed searches raise instead of returning, so they are never cached: Alchemy errors
+# propagate out of get_token_transfers as RuntimeError, and directory errors out of the identify
+# steps, rather than reading as "no transactions" or "no matches"
+@st.cache_data(ttl=600, max_entries=64, show_spinner=False)
+def get_search_results(address: str, blockchain: str) -> Dict[str, Any]:
+    """Dashboard data for an address; LookupError when it has no transfers, ValueError when analysis fails, RuntimeError when fetching fails."""
+    transfers_df = get_token_transfers(address, blockchain)
+    if transfers_df.empty:
+        raise LookupError(f"No transactions found for address {address} on {blockchain}")
+    data = analyze_transfers_data(transfers_df)
+    if not data:
+        raise ValueError(f"Unable to analyze transfers for address {address} on {blockchain}")
+    return data
 
 # Processing and results display
 if search_button:
@@ -977,29 +1294,25 @@ if search_button:
         
         # Get data from API
         try:
-            # Get token transfers data from Flipside API
+            # Get token transfers from Alchemy and analyze them (cached per address and blockchain)
             with st.spinner('Analyzing blockchain activity...'):
-                transfers_df = get_token_transfers(address, blockchain)
-            
-            # Check if any transfers were found
-            if transfers_df.empty:
-                st.warning(f"No transactions found for address {address} on {blockchain}. This could mean:\n" + 
-                          "- The address has no transactions in the last 7 days\n" +
-                          "- The address doesn't exist\n" +
-                          "- The address might be on a different network")
-                delete_cookie('has_searched')
-                st.stop()
-            
-            # Analyze the transfers data
-            data = analyze_transfers_data(transfers_df)
-            if not data:
-                st.error("Unable to analyze data. Please try again or check the address.")
-                delete_cookie('has_searched')
-                st.stop()
+                data = get_search_results(address, blockchain)
             
             # Store results in cookies
             set_cookie('current_results', data)
             
+        except LookupError:
+            # No transfers were found
+            st.warning(f"No transactions found for address {address} on {blockchain}. This could mean:\n" + 
+                      "- The address has no transactions in the last 7 days\n" +
+                      "- The address doesn't exist\n" +
+                      "- The address might be on a different network")
+            delete_cookie('has_searched')
+            st.stop()
+        except ValueError:
+            st.error("Unable to analyze data. Please try again or check the address.")
+            delete_cookie('has_searched')
+            st.stop()
         except Exception as e:
             st.error(f"Error processing data: {str(e)}")
             st.stop()
@@ -1061,11 +1374,10 @@ if get_cookie('has_searched') and get_cookie('current_results'):
         )
 
     with col5:
-        # Add new metric for suspicious senders
-        suspicious_senders = len(data["suspicious_transfers"]["from_address"].unique()) if not data["suspicious_transfers"].empty else 0
+        # Add new metric for suspicious senders (already counted when the results were built)
         st.metric(
             "High Risk Senders",
-            suspicious_senders
+            data["summary"]["suspicious_senders"]
         )
    
     st.markdown("</div>", unsafe_allow_html=True)
@@ -1098,30 +1410,7 @@ if get_cookie('has_searched') and get_cookie('current_results'):
         
         with chart_col:
             # --- Plotly Interactive Horizontal Stacked Bar Chart with Custom Palette ---
-            import plotly.graph_objects as go
-            # Custom palette: #102E50, #BE3D2A, #F5C45E
-            palette = ['#102E50', '#BE3D2A', '#F5C45E']
-            fig = go.Figure()
-            for i, row in tag_df.iterrows():
-                fig.add_trace(go.Bar(
-                    y=["Fraud Types"],
-                    x=[row["percent"]],
-                    name=row["tag"],
-                    orientation="h",
-                    marker=dict(color=palette[i % len(palette)]),
-                    hovertemplate=f"{row['tag']}: {row['percent']}%<extra></extra>",
-                    showlegend=True
-                ))
-            fig.update_layout(
-                barmode='stack',
-                height=120,
-                margin=dict(l=20, r=20, t=30, b=10),  # Adjusted top margin
-                xaxis=dict(range=[0, 100], showgrid=False, showticklabels=False),
-                yaxis=dict(showticklabels=False, showgrid=False),
-                plot_bgcolor='#f8fafc',
-                paper_bgcolor='#f8fafc',
-                legend=dict(orientation='h', yanchor='bottom', y=1.02, xanchor='center', x=0.5)
-            )
+            fig = build_fraud_type_figure(tag_df)
             st.markdown("""
                 <div style='text-align: left; margin-bottom: -0.8rem;'>
                     <h5 style='margin-bottom: 0.2rem; color: #2d3a4a; text-align: left;'>Affected Tokens by Fraud Type (%)</h5>
@@ -1138,34 +1427,11 @@ if get_cookie('has_searched') and get_cookie('current_results'):
         st.markdown("<div class='metric-card'>", unsafe_allow_html=True)
         st.subheader("Token Activity")
         # Bar chart for unique tokens from all and suspicious transfers (Plotly style with custom palette)
-        import plotly.graph_objects as go
-        tokens_timeline = data["tokens_timeline"]
-        x_labels = [d.strftime('%Y-%m-%d') for d in tokens_timeline.index]
-        palette = ['#F5C45E', '#BE3D2A']
-        fig = go.Figure()
-        fig.add_trace(go.Bar(
-            x=x_labels,
-            y=tokens_timeline["All Tokens"],
-            name="All Tokens",
-            marker_color=palette[0],
-            hovertemplate="All Tokens: %{y}<br>Date: %{x}<extra></extra>"
-        ))
-        fig.add_trace(go.Bar(
-            x=x_labels,
-            y=tokens_timeline["Suspicious Tokens"],
-            name="High Risk Tokens",
-            marker_color=palette[1],
-            hovertemplate="High Risk Tokens: %{y}<br>Date: %{x}<extra></extra>"
-        ))
-        fig.update_layout(
-            barmode='group',
-            height=260,
-            margin=dict(l=20, r=20, t=10, b=30),
-            xaxis=dict(title='Date', tickangle=-45, tickfont=dict(size=10)),
-            yaxis=dict(title='Number of Unique Tokens', gridcolor='rgba(30,41,59,0.08)'),
-            plot_bgcolor='#f8fafc',
-            paper_bgcolor='#f8fafc',
-            legend=dict(orientation='h', yanchor='bottom', y=1.1, xanchor='center', x=0.5)
+        fig = build_timeline_figure(
+            data["tokens_timeline"],
+            {"All Tokens": "All Tokens", "Suspicious Tokens": "High Risk Tokens"},
+            ['#F5C45E', '#BE3D2A'],
+            'Number of Unique Tokens'
         )
         st.plotly_chart(fig, use_container_width=True)
         st.markdown("</div>", unsafe_allow_html=True)
@@ -1174,34 +1440,11 @@ if get_cookie('has_searched') and get_cookie('current_results'):
         st.markdown("<div class='metric-card'>", unsafe_allow_html=True)
         st.subheader("Transfer Activity")
         # Bar chart for all and suspicious transfers (Plotly style with custom palette)
-        import plotly.graph_objects as go
-        activity_timeline = data["activity_timeline"]
-        x_labels = [d.strftime('%Y-%m-%d') for d in activity_timeline.index]
-        palette = ['#E78B48', '#BE3D2A']
-        fig = go.Figure()
-        fig.add_trace(go.Bar(
-            x=x_labels,
-            y=activity_timeline["All Transfers"],
-            name="All Transfers",
-            marker_color=palette[0],
-            hovertemplate="All Transfers: %{y}<br>Date: %{x}<extra></extra>"
-        ))
-        fig.add_trace(go.Bar(
-            x=x_labels,
-            y=activity_timeline["Suspicious Transfers"],
-            name="High Risk Transfers",
-            marker_color=palette[1],
-            hovertemplate="High Risk Transfers: %{y}<br>Date: %{x}<extra></extra>"
-        ))
-        fig.update_layout(
-            barmode='group',
-            height=260,
-            margin=dict(l=20, r=20, t=10, b=30),
-            xaxis=dict(title='Date', tickangle=-45, tickfont=dict(size=10)),
-            yaxis=dict(title='Number of Transfers', gridcolor='rgba(30,41,59,0.08)'),
-            plot_bgcolor='#f8fafc',
-            paper_bgcolor='#f8fafc',
-            legend=dict(orientation='h', yanchor='bottom', y=1.1, xanchor='center', x=0.5)
+        fig = build_timeline_figure(
+            data["activity_timeline"],
+            {"All Transfers": "All Transfers", "Suspicious Transfers": "High Risk Transfers"},
+            ['#E78B48', '#BE3D2A'],
+            'Number of Transfers'
         )
         st.plotly_chart(fig, use_container_width=True)
         st.markdown("</div>", unsafe_allow_html=True)
@@ -1214,23 +1457,7 @@ if get_cookie('has_searched') and get_cookie('current_results'):
     total_transfers = len(data["recent_transfers"])
     total_pages = (total_transfers + transfers_per_page - 1) // transfers_per_page
 
-    # Create a container for the header and pagination with custom CSS
-    st.markdown("""
-        <style>
-        .header-container {
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            margin-bottom: 1rem;
-        }
-        .page-selector {
-            width: 100px;
-            float: right;
-        }
-        </style>
-    """, unsafe_allow_html=True)
-
-    # Create header with flexbox layout
+    # Create header with flexbox layout (header-container is styled by APP_CSS)
     st.markdown("""
         <div class="header-container">
             <h3 style="margin: 0;">Recent Transfers</h3>
@@ -1251,55 +1478,9 @@ if get_cookie('has_searched') and get_cookie('current_results'):
     start_idx = (current_page - 1) * transfers_per_page
     end_idx = min(start_idx + transfers_per_page, total_transfers)
 
-    # Add column headers
-    header_cols = st.columns([2, 2, 2, 2, 1.5, 1.5, 2, 1.5, 1.5])
-    header_cols[0].write("**Tx Hash**")
-    header_cols[1].write("**Contract Address**")
-    header_cols[2].write("**From Address**")
-    header_cols[3].write("**To Address**")
-    header_cols[4].write("**Symbol**")
-    header_cols[5].write("**Block Timestamp**")
-    header_cols[6].write("**Status**")
-    header_cols[7].write("**Detail**")
-    st.divider()
-
-    # Add transaction rows for current page
-    # DEBUG: Print a sample of recent_transfers before rendering
-    print("Sample data['recent_transfers'] before rendering:")
-    import pandas as pd
-    try:
-        print(pd.DataFrame(data["recent_transfers"]).head(10)[["from_address", "to_address"]])
-    except Exception as e:
-        print("DEBUG print failed:", e)
-    for row in data["recent_transfers"][start_idx:end_idx]:
-        cols = st.columns([2, 2, 2, 2, 1.5, 1.5, 2, 1.5, 1.5])
-        cols[0].write(row["tx_hash"])
-        cols[1].write(row["contract_address"])
-        cols[2].write(row.get("from_address", ""))
-        cols[3].write(row.get("to_address", ""))
-        cols[4].write(row["symbol"])
-        cols[5].write(row.get("block_timestamp", ""))
-        # Status badge style
-        status = row.get("tag", "Caution")
-        status_color = "#b71c1c" if status and status != "Caution" and not row.get("safe", False) else "#2e7d32" if row.get("safe", False) else "#FFD700"  # Changed to yellow (#FFD700)
-        status_html = f"""
-            <span style='background-color: {status_color}; color: white; padding: 0.2em 0.7em; border-radius: 0.5em; font-size: 0.9em;'>
-                {status}
-            </span>
-        """
-        cols[6].markdown(status_html, unsafe_allow_html=True)
-        # Detail column (e.g., tag_1)
-        detail = row.get("tag_1", "No Detail")
-        if detail in ["Fake Stablecoin", "Fake Native", "Phishing"]:
-            detail_html = f"""
-                <span style='background-color: #b71c1c; color: white; padding: 0.2em 0.7em; border-radius: 0.5em; font-size: 0.9em;'>
-                    {detail}
-                </span>
-            """
-            cols[7].markdown(detail_html, unsafe_allow_html=True)
-        else:
-            cols[7].write(detail)
-        st.divider()
+    # Render the current page as a single styled table instead of one row of widgets per transfer
+    page = data["recent_transfers"].iloc[start_idx:end_idx]
+    st.dataframe(style_recent_transfers(page), use_container_width=True, hide_index=True)
 
     # Add pagination info at the bottom
     st.markdown(f"<div style='text-align: right; color: #666; font-size: 0.8em;'>Showing transfers {start_idx + 1}-{end_idx} of {total_transfers}</div>", unsafe_allow_html=True)
@@ -1318,9 +1499,8 @@ if get_cookie('has_searched') and get_cookie('current_results'):
         """, unsafe_allow_html=True)
 
         # Add page selector in top right
-        susp = data["suspicious_transfers"]
-        # Remove duplicate tokens based on contract_address (keep first occurrence)
-        susp = susp.drop_duplicates(subset=["contract_address"])
+        # Tokens are deduplicated once when the results are built, not on every page change
+        susp = data["suspicious_transfers_unique"]
         tokens_per_page = 5  # Number of tokens to show per page
         total_tokens = len(susp)
         total_pages = (total_tokens + tokens_per_page - 1) // tokens_per_page
@@ -1338,48 +1518,9 @@ if get_cookie('has_searched') and get_cookie('current_results'):
         start_idx = (current_page - 1) * tokens_per_page
         end_idx = min(start_idx + tokens_per_page, total_tokens)
 
-        # Display the paginated table with custom style (like Recent Transfers)
-        display_cols = ["contract_address", "name", "symbol", "created_block_timestamp", "tag", "tag_1"]
-        for col in display_cols:
-            if col not in susp.columns:
-                susp[col] = ''
-        # Table headers
-        header_cols = st.columns([3, 2, 3, 2, 2, 2])
-        header_cols[0].write("**Contract Address**")
-        header_cols[1].write("**Name**")
-        header_cols[2].write("**Symbol**")
-        header_cols[3].write("**Created Blocktime**")
-        header_cols[4].write("**Status**")
-        header_cols[5].write("**Detail**")
-        st.divider()
-        # Table rows
-        for _, row in susp.iloc[start_idx:end_idx].iterrows():
-            cols = st.columns([3, 2, 3, 2, 2, 2])
-            cols[0].write(row["contract_address"])
-            cols[1].write(row["name"])
-            cols[2].write(row["symbol"])
-            cols[3].write(row["created_block_timestamp"])
-            # Status badge style (red for high risk, yellow for caution, green for safe)
-            status = row.get("tag", "Caution")
-            status_color = "#b71c1c" if status and status.lower() not in ["caution", "safe"] else ("#2e7d32" if status.lower() == "safe" else "#FFD700")
-            status_html = f"""
-                <span style='background-color: {status_color}; color: white; padding: 0.2em 0.7em; border-radius: 0.5em; font-size: 0.9em;'>
-                    {status}
-                </span>
-            """
-            cols[4].markdown(status_html, unsafe_allow_html=True)
-            # Detail column
-            detail = row.get("tag_1", "No Detail")
-            if detail in ["Fake Stablecoin", "Fake Native", "Phishing"]:
-                detail_html = f"""
-                    <span style='background-color: #b71c1c; color: white; padding: 0.2em 0.7em; border-radius: 0.5em; font-size: 0.9em;'>
-                        {detail}
-                    </span>
-                """
-                cols[5].markdown(detail_html, unsafe_allow_html=True)
-            else:
-                cols[5].write(detail)
-            st.divider()
+        # Display the page as one styled table, like Recent Transfers
+        page = susp.iloc[start_idx:end_idx]
+        st.dataframe(style_high_risk_tokens(page), use_container_width=True, hide_index=True)
 
 
 else: